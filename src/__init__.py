@@ -1,4 +1,4 @@
 """Top-level package for rag-chunk."""
 
-__all__ = ["parser", "chunker", "scorer", "cli"]
+__all__ = ["parser", "chunker", "scorer", "pipeline", "watch", "cli"]
 __version__ = "0.3.0"
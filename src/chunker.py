@@ -1,6 +1,7 @@
 """Chunking strategies."""
 
-from typing import Dict, List
+import re
+from typing import Dict, List, Tuple
 
 try:
     import tiktoken
@@ -67,6 +68,29 @@ def count_tokens(
     return len([t for t in text.split() if t])
 
 
+def count_tokens_batch(
+    texts: List[str], use_tiktoken: bool = False, model: str = "gpt-3.5-turbo"
+) -> List[int]:
+    """Count tokens for many texts with a single tokenizer call.
+
+    Args:
+        texts: Texts to count tokens in
+        use_tiktoken: If True, use tiktoken's batched encoder
+        model: Model name for tiktoken encoding
+
+    Returns:
+        Number of tokens for each text, in input order
+    """
+    if use_tiktoken:
+        if not TIKTOKEN_AVAILABLE:
+            raise ImportError(
+                "tiktoken is not installed. Install it with: pip install rag-chunk[tiktoken]"
+            )
+        encoding = tiktoken.encoding_for_model(model)
+        return [len(ids) for ids in encoding.encode_batch(texts)]
+    return [len(t.split()) for t in texts]
+
+
 def fixed_size_chunks(
     text: str, chunk_size: int, use_tiktoken: bool = False, model: str = "gpt-3.5-turbo"
 ) -> List[Dict]:
@@ -187,6 +211,270 @@ def recursive_character_chunks(
     return [{"id": i, "text": t} for i, t in enumerate(texts)]
 
 
+_MD_HEADING_RE = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?[ \t]*$")
+_MD_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+# Optional closing sequence of a heading; it must follow a space (CommonMark).
+_MD_CLOSING_HASHES_RE = re.compile(r"(?:^|[ \t]+)#+$")
+
+
+def _scan_markdown_blocks(
+    text: str,
+) -> List[Tuple[int, int, str, Tuple[Tuple[int, str], ...]]]:
+    """Scan markdown once and return structural blocks as character offsets.
+
+    Blocks are headings, fenced code, tables and runs of other text separated
+    by blank lines. Each block carries the heading path in effect at its start,
+    as a tuple of (level, title) pairs.
+
+    Args:
+        text: Raw markdown text
+
+    Returns:
+        List of (start, end, kind, heading_path) tuples in document order
+    """
+    blocks = []
+    path: Tuple[Tuple[int, str], ...] = ()
+    fence = None
+    block_start = None
+    block_end = 0
+    block_kind = ""
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        start = pos
+        pos += len(line)
+        stripped = line.strip()
+        if fence:
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                blocks.append((block_start, pos, "code", path))
+                block_start = None
+                fence = None
+            continue
+        fence_match = _MD_FENCE_RE.match(line)
+        heading_match = None if fence_match else _MD_HEADING_RE.match(line)
+        kind = "table" if stripped.startswith("|") else "text"
+        if block_start is not None and (
+            fence_match or heading_match or not stripped or kind != block_kind
+        ):
+            blocks.append((block_start, block_end, block_kind, path))
+            block_start = None
+        if fence_match:
+            fence = fence_match.group(1)
+            block_start = start
+        elif heading_match:
+            level = len(heading_match.group(1))
+            path = tuple(h for h in path if h[0] < level) + (
+                (level, _MD_CLOSING_HASHES_RE.sub("", heading_match.group(2) or "")),
+            )
+            blocks.append((start, pos, "heading", path))
+        elif stripped:
+            if block_start is None:
+                block_start = start
+                block_kind = kind
+            block_end = pos
+    if fence:
+        blocks.append((block_start, pos, "code", path))
+    elif block_start is not None:
+        blocks.append((block_start, block_end, block_kind, path))
+    return blocks
+
+
+def markdown_section_chunks(
+    text: str,
+    chunk_size: int = 200,
+    use_tiktoken: bool = False,
+    model: str = "gpt-3.5-turbo",
+) -> List[Dict]:
+    """Split markdown into heading-aware sections packed up to a token budget.
+
+    Consecutive sections are merged while they fit in ``chunk_size``. Sections
+    that are too large are split at block boundaries (paragraphs, code fences,
+    tables), so fenced code and tables are never cut; a heading always stays
+    with the block that follows it. A single block larger than the budget
+    becomes its own chunk. ``heading_path`` is the path where a chunk starts
+    and ``heading_paths`` lists every path the chunk spans.
+
+    Args:
+        text: Raw markdown text (headings and newlines preserved)
+        chunk_size: Maximum number of tokens per chunk
+        use_tiktoken: If True, use tiktoken for token counting
+        model: Model name for tiktoken encoding
+
+    Returns:
+        List of chunk dictionaries with 'id', 'text', 'heading_path' and
+        'heading_paths' keys
+    """
+    blocks = _scan_markdown_blocks(text)
+    counts = count_tokens_batch(
+        [text[start:end] for start, end, _, _ in blocks],
+        use_tiktoken=use_tiktoken,
+        model=model,
+    )
+
+    chunks = _pack_units(_section_units(blocks, counts, chunk_size), chunk_size)
+    return [
+        {
+            "id": i,
+            "text": text[blocks[first][0] : blocks[last][1]].strip(),
+            "heading_path": [title for _, title in blocks[first][3]],
+            "heading_paths": _heading_paths(blocks[first : last + 1]),
+        }
+        for i, (first, last, _) in enumerate(chunks)
+    ]
+
+
+def _section_units(blocks, counts, chunk_size):
+    """Return (first_block, last_block, tokens) units to pack into chunks.
+
+    A section that fits the budget is one unit; larger sections become one
+    unit per block, with the heading kept on the first block. A unit that
+    holds only headings (a parent with no body of its own) is glued to the
+    next unit so it is never emitted by itself.
+    """
+    units = []
+    section_start = 0
+    for i in range(1, len(blocks) + 1):
+        if i < len(blocks) and blocks[i][2] != "heading":
+            continue
+        tokens = sum(counts[section_start:i])
+        if tokens <= chunk_size:
+            units.append((section_start, i - 1, tokens))
+        else:
+            head = section_start
+            if blocks[section_start][2] == "heading":
+                head = min(section_start + 1, i - 1)
+            units.append((section_start, head, sum(counts[section_start : head + 1])))
+            units.extend((j, j, counts[j]) for j in range(head + 1, i))
+        section_start = i
+
+    merged = []
+    pending = None
+    for first, last, tokens in units:
+        if pending:
+            first, tokens = pending[0], pending[2] + tokens
+        pending = (first, last, tokens) if blocks[last][2] == "heading" else None
+        if not pending:
+            merged.append((first, last, tokens))
+    if pending:
+        merged.append(pending)
+    return merged
+
+
+def _pack_units(units, chunk_size):
+    """Greedily merge consecutive units while they fit in chunk_size."""
+    chunks = []
+    for first, last, tokens in units:
+        if chunks and chunks[-1][2] + tokens <= chunk_size:
+            chunks[-1][1] = last
+            chunks[-1][2] += tokens
+        else:
+            chunks.append([first, last, tokens])
+    return chunks
+
+
+def _heading_paths(blocks):
+    """Return the distinct heading paths spanned by blocks, in order."""
+    paths = []
+    for block in blocks:
+        path = [title for _, title in block[3]]
+        if not paths or paths[-1] != path:
+            paths.append(path)
+    return paths
+
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on terminal punctuation and blank lines.
+
+    Uses the markdown block scanner, so headings, fenced code blocks and
+    tables are each kept whole as a single unit; only prose is split.
+    """
+    sentences = []
+    for start, end, kind, _ in _scan_markdown_blocks(text):
+        block = text[start:end].strip()
+        if kind == "text":
+            sentences.extend(s.strip() for s in _SENTENCE_END_RE.split(block) if s.strip())
+        elif block:
+            sentences.append(block)
+    return sentences
+
+
+def sentence_pack_chunks(
+    text: str,
+    chunk_size: int = 200,
+    overlap: int = 0,
+    use_tiktoken: bool = False,
+    model: str = "gpt-3.5-turbo",
+) -> List[Dict]:
+    """Greedily pack whole sentences into chunks up to a token budget.
+
+    Sentence token counts are computed once in a batch and turned into prefix
+    sums, so packing never re-tokenizes text. Each chunk repeats the trailing
+    sentences of the previous one that fit within ``overlap`` tokens, as long
+    as the next sentence still fits alongside them. A single sentence larger
+    than the budget becomes its own chunk.
+
+    Args:
+        text: Text to chunk
+        chunk_size: Maximum number of tokens per chunk
+        overlap: Maximum number of tokens of whole sentences to repeat
+        use_tiktoken: If True, use tiktoken for token counting
+        model: Model name for tiktoken encoding
+
+    Returns:
+        List of chunk dictionaries with 'id' and 'text' keys
+    """
+    sentences = split_sentences(text)
+    prefix = [0]
+    for n in count_tokens_batch(sentences, use_tiktoken=use_tiktoken, model=model):
+        prefix.append(prefix[-1] + n)
+
+    chunks = []
+    start = 0
+    end = 0
+    while start < len(sentences):
+        end = max(end, start + 1)
+        while end < len(sentences) and prefix[end + 1] - prefix[start] <= chunk_size:
+            end += 1
+        chunks.append({"id": len(chunks), "text": " ".join(sentences[start:end])})
+        if end == len(sentences):
+            break
+        # Carry trailing sentences over, but always leave room for a new one.
+        next_start = start + 1
+        while next_start < end and (
+            prefix[end] - prefix[next_start] > overlap
+            or prefix[end + 1] - prefix[next_start] > chunk_size
+        ):
+            next_start += 1
+        start = next_start
+    return chunks
+
+
+# Strategies that need the raw markdown (headings, fences, newlines) rather
+# than the whitespace-normalized text produced by the parser.
+STRUCTURE_AWARE_STRATEGIES = {"markdown-section", "sentence-pack"}
+
+
+def chunk_documents(strategy: str, texts: List[str], **opts) -> List[Dict]:
+    """Chunk each document separately with a strategy and renumber chunk ids.
+
+    Args:
+        strategy: Name of a strategy in ``STRATEGIES``
+        texts: Document texts, chunked independently in order
+        opts: chunk_size, overlap, use_tiktoken and model for the strategy
+
+    Returns:
+        List of chunk dictionaries with ids numbered across all documents
+    """
+    chunks = []
+    for text in texts:
+        for chunk in STRATEGIES[strategy](text, **opts):
+            chunk["id"] = len(chunks)
+            chunks.append(chunk)
+    return chunks
+
+
 STRATEGIES = {
     "fixed-size": (
         lambda text, chunk_size=200, overlap=0, use_tiktoken=False, model="gpt-3.5-turbo":
@@ -221,4 +509,23 @@ STRATEGIES = {
                 model=model,
             )
     ),
+    "markdown-section": (
+        lambda text, chunk_size=200, overlap=0, use_tiktoken=False, model="gpt-3.5-turbo":
+            markdown_section_chunks(
+                text,
+                chunk_size,
+                use_tiktoken=use_tiktoken,
+                model=model,
+            )
+    ),
+    "sentence-pack": (
+        lambda text, chunk_size=200, overlap=0, use_tiktoken=False, model="gpt-3.5-turbo":
+            sentence_pack_chunks(
+                text,
+                chunk_size,
+                overlap,
+                use_tiktoken=use_tiktoken,
+                model=model,
+            )
+    ),
 }
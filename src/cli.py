@@ -8,8 +8,10 @@ from pathlib import Path
 
 from . import chunker
 from . import parser as mdparser
+from . import pipeline
 from . import scorer
 from . import __version__
+from .watch import WatchSession, poll_changes
 
 try:
     from rich.console import Console
@@ -22,12 +24,25 @@ except ImportError:  # pragma: no cover - optional dependency
     console = None
 
 
-def write_chunks(chunks, strategy: str):
-    """Write chunks to .chunks directory with timestamp subfolder."""
-    base = Path(".chunks")
+# Chunks per batch streamed from the chunk stage to write and evaluate.
+PIPELINE_BATCH_SIZE = 64
+
+
+def _chunk_output_dir(strategy: str) -> Path:
+    """Create and return the timestamped .chunks subfolder for a strategy."""
     stamp = time.strftime("%Y%m%d-%H%M%S")
-    outdir = base / f"{strategy}-{stamp}"
+    outdir = Path(".chunks") / f"{strategy}-{stamp}"
     outdir.mkdir(parents=True, exist_ok=True)
+    return outdir
+
+
+def write_chunks(chunks, strategy: str, outdir: Path = None):
+    """Write chunks to .chunks directory with timestamp subfolder.
+
+    If outdir is given, chunks are added to that existing folder instead.
+    """
+    if outdir is None:
+        outdir = _chunk_output_dir(strategy)
     for c in chunks:
         (outdir / f"chunk_{c['id']}.txt").write_text(c["text"], encoding="utf-8")
     return outdir
@@ -59,40 +74,227 @@ def analyze(args):
         int: exit code (0 on success, non-zero on error)
     """
 
+    if getattr(args, "pipeline", False):
+        return _analyze_pipelined(args)
     docs = mdparser.read_markdown_folder(args.folder)
     if not docs:
         print("No markdown files found")
         return 1
     text = mdparser.clean_markdown_text(docs)
+    results = []
+    for strat in _selected_strategies(args):
+        texts = _strategy_texts(strat, text, docs)
+        result, per_questions = _run_strategy(texts, strat, args)
+        result["per_questions"] = per_questions
+        results.append(result)
+    _write_results(results, None, args.output)
+    if not args.test_file:
+        print(f"Total text length (chars): {len(text)}")
+    return 0
+
+
+def _selected_strategies(args):
+    """Return known strategy names requested by args, reporting unknown ones."""
     strategies = (
         [args.strategy] if args.strategy != "all" else list(chunker.STRATEGIES.keys())
     )
-    results = []
+    selected = []
     for strat in strategies:
-        func = chunker.STRATEGIES.get(strat)
-        if not func:
+        if strat not in chunker.STRATEGIES:
             print(f"Unknown strategy: {strat}")
             continue
-        result, per_questions = _run_strategy(text, func, strat, args)
-        result["per_questions"] = per_questions
-        results.append(result)
+        selected.append(strat)
+    return selected
+
+
+def _strategy_texts(strat, text, docs):
+    """Return the texts a strategy chunks.
+
+    Structure-aware strategies chunk each raw markdown document on its own so
+    headings and open code fences never carry over into the next file; the
+    others chunk the cleaned, concatenated corpus.
+    """
+    if strat in chunker.STRUCTURE_AWARE_STRATEGIES:
+        return [t for _, t in docs]
+    return [text]
+
+
+def _analyze_pipelined(args):
+    """Analyze using the pipelined executor and report per-stage utilization.
+
+    Files are read on I/O threads. Chunking starts once all files are read,
+    since most strategies chunk the concatenated corpus; each strategy's chunks
+    are then streamed in batches through write (thread) and evaluate (process)
+    stages while other strategies are still being chunked.
+    """
+    workers = getattr(args, "workers", 2)
+    files = mdparser.list_markdown_files(args.folder)
+    if not files:
+        print("No markdown files found")
+        return 1
+    docs, read_stats = pipeline.run_pipeline(
+        files, [("read", mdparser.read_markdown_file, "thread")], io_threads=workers
+    )
+    text = mdparser.clean_markdown_text(docs)
+    questions = scorer.load_test_file(args.test_file) if args.test_file else None
+    jobs = [
+        {
+            "strategy": strat,
+            "texts": _strategy_texts(strat, text, docs),
+            "chunk_size": args.chunk_size,
+            "overlap": args.overlap,
+            "use_tiktoken": getattr(args, "use_tiktoken", False),
+            "model": getattr(args, "tiktoken_model", "gpt-3.5-turbo"),
+            "questions": questions,
+            "top_k": args.top_k,
+            "outdir": str(_chunk_output_dir(strat)),
+        }
+        for strat in _selected_strategies(args)
+    ]
+    batches, stage_stats = pipeline.run_pipeline(
+        jobs,
+        [
+            ("chunk", _chunk_job, "process"),
+            ("write", _write_job, "thread"),
+            ("evaluate", _evaluate_job, "process"),
+        ],
+        workers=workers,
+        io_threads=workers,
+    )
+    results = [_merge_batches(job, batches) for job in jobs]
+    # The read phase runs before the others; its utilization uses its own wall time.
+    stage_stats = [{"phase": "read", **s} for s in read_stats] + [
+        {"phase": "pipeline", **s} for s in stage_stats
+    ]
+    if args.output == "json":
+        _write_results(results, {"stages": stage_stats}, args.output)
+        return 0
     _write_results(results, None, args.output)
+    print(format_table(stage_stats))
     if not args.test_file:
         print(f"Total text length (chars): {len(text)}")
     return 0
 
 
-def _run_strategy(text, func, strat, args):
+def _chunk_job(job):
+    """Pipeline stage: chunk job text and split the chunks into batches."""
+    chunks = chunker.chunk_documents(
+        job["strategy"],
+        job["texts"],
+        chunk_size=job["chunk_size"],
+        overlap=job["overlap"],
+        use_tiktoken=job["use_tiktoken"],
+        model=job["model"],
+    )
+    return pipeline.FanOut(
+        {
+            "strategy": job["strategy"],
+            "outdir": job["outdir"],
+            "questions": job["questions"],
+            "top_k": job["top_k"],
+            "offset": i,
+            "chunks": chunks[i : i + PIPELINE_BATCH_SIZE],
+        }
+        for i in range(0, len(chunks), PIPELINE_BATCH_SIZE)
+    )
+
+
+def _write_job(batch):
+    """Pipeline stage: write a batch of chunks to its strategy folder."""
+    write_chunks(batch["chunks"], batch["strategy"], Path(batch["outdir"]))
+    return batch
+
+
+def _evaluate_job(batch):
+    """Pipeline stage: collect each question's top-k candidates in a batch."""
+    candidates = scorer.top_k_candidates(
+        batch["chunks"], batch["questions"] or [], batch["top_k"], batch["offset"]
+    )
+    return {
+        "strategy": batch["strategy"],
+        "count": len(batch["chunks"]),
+        "candidates": candidates,
+    }
+
+
+def _merge_batches(job, batches):
+    """Combine a strategy's evaluated batches into its result row."""
+    own = [b for b in batches if b["strategy"] == job["strategy"]]
+    if job["questions"]:
+        metrics, per_questions = scorer.merge_candidates(
+            [b["candidates"] for b in own], job["questions"], job["top_k"]
+        )
+    else:
+        metrics = {"avg_recall": 0.0, "avg_precision": 0.0, "avg_f1": 0.0}
+        per_questions = []
+    result = _result_row(
+        job["strategy"], sum(b["count"] for b in own), metrics, job["outdir"]
+    )
+    result["per_questions"] = per_questions
+    return result
+
+
+def watch(args):
+    """Watch a folder and reprint metrics whenever markdown files change.
+
+    Chunks and retrieval candidates are kept per document, so each update only
+    re-chunks and re-scores the files whose mtime or size changed.
+
+    Args:
+        args: argparse.Namespace with the analyze chunking attributes plus
+            interval and output
+
+    Returns:
+        int: exit code (0 when interrupted with Ctrl+C, 1 if folder is missing)
+    """
+    if not Path(args.folder).is_dir():
+        print(f"Folder not found: {args.folder}")
+        return 1
+    questions = scorer.load_test_file(args.test_file) if args.test_file else []
+    sessions = [
+        WatchSession(
+            strat,
+            questions,
+            args.top_k,
+            chunk_size=args.chunk_size,
+            overlap=args.overlap,
+            use_tiktoken=getattr(args, "use_tiktoken", False),
+            model=getattr(args, "tiktoken_model", "gpt-3.5-turbo"),
+        )
+        for strat in _selected_strategies(args)
+    ]
+    signatures = {}
+    try:
+        while True:
+            started = time.perf_counter()
+            changes = poll_changes(args.folder, signatures)
+            for session in sessions:
+                session.apply(changes)
+            if changes:
+                elapsed = (time.perf_counter() - started) * 1000
+                print(
+                    f"[{time.strftime('%H:%M:%S')}] updated {len(changes)} "
+                    f"file(s) in {elapsed:.1f} ms"
+                )
+                _write_results([s.result_row() for s in sessions], None, args.output)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+def _run_strategy(texts, strat, args):
     """Run a single chunking strategy and return result dict and per-question details.
 
     Args:
-        text: Full cleaned text
-        func: chunking function
+        texts: Texts to chunk, as returned by ``_strategy_texts``: the full
+            cleaned text, or each raw markdown document for strategies in
+            ``chunker.STRUCTURE_AWARE_STRATEGIES``
         strat: strategy name
         args: argparse.Namespace containing configuration
     """
-    chunks = func(
-        text,
+    chunks = chunker.chunk_documents(
+        strat,
+        texts,
         chunk_size=args.chunk_size,
         overlap=args.overlap,
         use_tiktoken=getattr(args, "use_tiktoken", False),
@@ -109,14 +311,19 @@ def _run_strategy(text, func, strat, args):
     else:
         metrics = {"avg_recall": 0.0, "avg_precision": 0.0, "avg_f1": 0.0}
         per_questions = []
+    return _result_row(strat, len(chunks), metrics, outdir), per_questions
+
+
+def _result_row(strat, n_chunks, metrics, outdir):
+    """Return the summary row reported for one strategy."""
     return {
         "strategy": strat,
-        "chunks": len(chunks),
+        "chunks": n_chunks,
         "avg_recall": round(metrics["avg_recall"], 4),
         "avg_precision": round(metrics["avg_precision"], 4),
         "avg_f1": round(metrics["avg_f1"], 4),
         "saved": str(outdir),
-    }, per_questions
+    }
 
 
 def _write_results(results, detail, output):
@@ -197,14 +404,26 @@ def _write_results(results, detail, output):
     return
 
 
-def build_parser():
-    """Build and return the CLI argument parser."""
-    ap = argparse.ArgumentParser(prog="rag-chunk")
-    ap.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
-    sub = ap.add_subparsers(dest="command")
-    analyze_p = sub.add_parser("analyze", help="Analyze a folder of markdown files")
-    analyze_p.add_argument("folder", type=str, help="Folder containing .md files")
-    analyze_p.add_argument(
+def _positive_int(value):
+    """argparse type accepting integers greater than zero."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def _positive_float(value):
+    """argparse type accepting numbers greater than zero."""
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
+def _add_chunking_args(p):
+    """Add folder, strategy, chunking and evaluation arguments to a subparser."""
+    p.add_argument("folder", type=str, help="Folder containing .md files")
+    p.add_argument(
         "--strategy",
         type=str,
         default="fixed-size",
@@ -213,36 +432,61 @@ def build_parser():
             "sliding-window",
             "paragraph",
             "recursive-character",
+            "markdown-section",
+            "sentence-pack",
             "all",
         ],
         help="Chunking strategy or all",
     )
-    analyze_p.add_argument(
+    p.add_argument(
         "--chunk-size", type=int, default=200, help="Chunk size in words or tokens"
     )
-    analyze_p.add_argument(
+    p.add_argument(
         "--overlap",
         type=int,
         default=50,
-        help="Overlap in words or tokens for sliding-window",
+        help="Overlap in words or tokens for sliding-window and sentence-pack",
     )
-    analyze_p.add_argument(
+    p.add_argument(
         "--use-tiktoken",
         action="store_true",
         help="Use tiktoken for precise token-based chunking (requires tiktoken package)",
     )
-    analyze_p.add_argument(
+    p.add_argument(
         "--tiktoken-model",
         type=str,
         default="gpt-3.5-turbo",
         help="Model name for tiktoken encoding (default: gpt-3.5-turbo)",
     )
-    analyze_p.add_argument(
+    p.add_argument(
         "--test-file", type=str, default="", help="Path to JSON test file"
     )
-    analyze_p.add_argument(
+    p.add_argument(
         "--top-k", type=int, default=3, help="Top k chunks to retrieve per question"
     )
+
+
+def build_parser():
+    """Build and return the CLI argument parser."""
+    ap = argparse.ArgumentParser(prog="rag-chunk")
+    ap.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    sub = ap.add_subparsers(dest="command")
+    analyze_p = sub.add_parser("analyze", help="Analyze a folder of markdown files")
+    _add_chunking_args(analyze_p)
+    analyze_p.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap reading, chunking, writing and scoring in pipelined stages",
+    )
+    analyze_p.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=2,
+        help=(
+            "For --pipeline: worker processes per CPU stage (chunk, evaluate) "
+            "and threads per I/O stage (read, write)"
+        ),
+    )
     analyze_p.add_argument(
         "--output",
         type=str,
@@ -250,6 +494,23 @@ def build_parser():
         choices=["table", "json", "csv"],
         help="Output format",
     )
+    watch_p = sub.add_parser(
+        "watch", help="Re-chunk and re-score changed markdown files continuously"
+    )
+    _add_chunking_args(watch_p)
+    watch_p.add_argument(
+        "--interval",
+        type=_positive_float,
+        default=1.0,
+        help="Seconds between polls for file changes",
+    )
+    watch_p.add_argument(
+        "--output",
+        type=str,
+        default="table",
+        choices=["table", "json"],
+        help="Output format",
+    )
     return ap
 
 
@@ -263,6 +524,9 @@ def main():
     if args.command == "analyze":
         code = analyze(args)
         raise SystemExit(code)
+    if args.command == "watch":
+        code = watch(args)
+        raise SystemExit(code)
     ap.print_help()
 
 
@@ -3,20 +3,27 @@
 from pathlib import Path
 
 
-def read_markdown_folder(folder: str) -> list:
-    """Return list of (path, text) for all .md and .txt files in folder (non-recursive)."""
+def list_markdown_files(folder: str) -> list:
+    """Return paths of all .md and .txt files in folder (non-recursive)."""
     p = Path(folder)
-    files = [
+    return [
         f for f in p.iterdir() if f.is_file() and f.suffix.lower() in [".md", ".txt"]
     ]
-    result = []
-    for f in files:
-        try:
-            text = f.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            text = f.read_text(errors="ignore")
-        result.append((str(f), text))
-    return result
+
+
+def read_markdown_file(path) -> tuple:
+    """Return (path, text) for a single file, ignoring undecodable bytes."""
+    f = Path(path)
+    try:
+        text = f.read_text(encoding="utf-8")
+    except UnicodeDecodeError:
+        text = f.read_text(encoding="utf-8", errors="ignore")
+    return (str(f), text)
+
+
+def read_markdown_folder(folder: str) -> list:
+    """Return list of (path, text) for all .md and .txt files in folder (non-recursive)."""
+    return [read_markdown_file(f) for f in list_markdown_files(folder)]
 
 
 def clean_markdown_text(docs: list) -> str:
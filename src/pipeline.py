@@ -0,0 +1,195 @@
+"""Pipelined stage executor connected by bounded queues."""
+
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Tuple
+
+_DONE = object()
+
+# (name, function, kind) where kind is "thread" for I/O-bound stages and
+# "process" for CPU-bound stages. Process stage functions must be picklable.
+Stage = Tuple[str, Callable, str]
+
+
+class FanOut(list):
+    """Stage result whose elements continue downstream as separate items."""
+
+
+def _timed_call(func, payload):
+    """Run func where the stage executes and return (result, seconds in func)."""
+    start = time.perf_counter()
+    result = func(payload)
+    return result, time.perf_counter() - start
+
+
+def _run_item(stage, shared, payload):
+    """Run one payload through a stage and record its timings.
+
+    Busy time is measured inside the thread or worker process running the
+    function; for process stages the remaining round-trip (pickling, pool
+    start-up) is recorded as overhead.
+    """
+    dispatched = time.perf_counter()
+    if stage["kind"] == "process":
+        result, busy = stage["pool"].submit(_timed_call, stage["func"], payload).result()
+    else:
+        result, busy = _timed_call(stage["func"], payload)
+    with shared["lock"]:
+        stage["stat"]["busy_s"] += busy
+        stage["stat"]["overhead_s"] += time.perf_counter() - dispatched - busy
+        stage["stat"]["items"] += 1
+    return result
+
+
+def _stage_worker(stage, inbox, outbox, shared):
+    """Pull items from inbox, apply the stage function and push to outbox.
+
+    Args:
+        stage: Dict with func, kind, pool, stat and active (running worker count)
+        inbox: Queue feeding this stage
+        outbox: Queue feeding the next stage
+        shared: Dict with lock and errors shared by all stages
+    """
+    lock = shared["lock"]
+    stat = stage["stat"]
+    while True:
+        waited = time.perf_counter()
+        item = inbox.get()
+        with lock:
+            stat["wait_s"] += time.perf_counter() - waited
+        if item is _DONE:
+            # Let sibling workers see the sentinel; the last one forwards it.
+            inbox.put(_DONE)
+            with lock:
+                stage["active"] -= 1
+                last = stage["active"] == 0
+            if last:
+                outbox.put(_DONE)
+            return
+        index, payload = item
+        try:
+            payload = _run_item(stage, shared, payload)
+        except Exception as exc:  # pylint: disable=broad-except
+            with lock:
+                shared["errors"].append(exc)
+            continue
+        outputs = (
+            [(index + (j,), p) for j, p in enumerate(payload)]
+            if isinstance(payload, FanOut)
+            else [(index, payload)]
+        )
+        blocked = time.perf_counter()
+        for output in outputs:
+            outbox.put(output)
+        with lock:
+            stat["blocked_s"] += time.perf_counter() - blocked
+
+
+def _build_workers(stages, queues, shared, workers, io_threads):
+    """Create (unstarted) worker threads and a stats dict for every stage."""
+    stats = []
+    threads = []
+    for i, (name, func, kind) in enumerate(stages):
+        count = workers if kind == "process" else io_threads
+        stat = {"stage": name, "workers": count, "items": 0}
+        stat.update(dict.fromkeys(("busy_s", "overhead_s", "wait_s", "blocked_s"), 0.0))
+        stats.append(stat)
+        stage = {"func": func, "kind": kind, "stat": stat, "active": count, "pool": None}
+        if kind == "process":
+            stage["pool"] = ProcessPoolExecutor(
+                max_workers=count, mp_context=multiprocessing.get_context("spawn")
+            )
+            shared["pools"].append(stage["pool"])
+        threads.extend(
+            threading.Thread(
+                target=_stage_worker,
+                args=(stage, queues[i], queues[i + 1], shared),
+                daemon=True,
+            )
+            for _ in range(count)
+        )
+    return threads, stats
+
+
+def _feed_and_collect(items, queues, threads):
+    """Feed indexed items into the first queue and collect the last one."""
+    for index, payload in enumerate(items):
+        queues[0].put(((index,), payload))
+    queues[0].put(_DONE)
+    results = []
+    while True:
+        item = queues[-1].get()
+        if item is _DONE:
+            break
+        results.append(item)
+    for t in threads:
+        t.join()
+    return results
+
+
+def _finish_stats(stats, wall):
+    """Round timings and add utilization (busy time over worker capacity)."""
+    for stat in stats:
+        for key in ("busy_s", "overhead_s", "wait_s", "blocked_s"):
+            stat[key] = round(stat[key], 4)
+        capacity = wall * stat["workers"]
+        stat["utilization"] = round(stat["busy_s"] / capacity, 4) if capacity else 0.0
+
+
+def run_pipeline(
+    items: Iterable,
+    stages: List[Stage],
+    workers: int = 2,
+    io_threads: int = 2,
+    maxsize: int = 4,
+) -> Tuple[List, List[Dict]]:
+    """Run items through stages concurrently and return results in input order.
+
+    Each stage reads from a bounded queue and writes to the next one, so a slow
+    stage applies backpressure to the stages feeding it. Thread stages run on
+    ``io_threads`` threads; each process stage has its own pool of ``workers``
+    processes, so its utilization is not diluted by other stages. A stage that
+    returns a ``FanOut`` sends each of its elements downstream separately.
+
+    Args:
+        items: Input payloads for the first stage
+        stages: List of (name, function, kind) tuples
+        workers: Number of worker processes per process stage
+        io_threads: Number of threads per thread stage
+        maxsize: Capacity of each inter-stage queue
+
+    Returns:
+        Tuple of (results, stage_stats). stage_stats holds one dict per stage
+        with stage, workers, items, busy_s (time inside the stage function),
+        overhead_s (process dispatch round-trip), wait_s (blocked on an empty
+        input queue), blocked_s (blocked on a full output queue) and
+        utilization keys.
+
+    Raises:
+        ValueError: If workers or io_threads is less than 1.
+        The first exception raised by any stage, after the pipeline drains.
+    """
+    if workers < 1 or io_threads < 1:
+        raise ValueError("workers and io_threads must be at least 1")
+    queues = [queue.Queue(maxsize) for _ in stages] + [queue.Queue()]
+    shared = {"pools": [], "lock": threading.Lock(), "errors": []}
+    threads, stats = _build_workers(stages, queues, shared, workers, io_threads)
+
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    try:
+        results = _feed_and_collect(items, queues, threads)
+    finally:
+        for pool in shared["pools"]:
+            pool.shutdown()
+    wall = time.perf_counter() - started
+
+    _finish_stats(stats, wall)
+    if shared["errors"]:
+        raise shared["errors"][0]
+    results.sort(key=lambda x: x[0])
+    return [payload for _, payload in results], stats
@@ -14,10 +14,18 @@ def load_test_file(path: str) -> List[Dict]:
     return data
 
 
+def word_set(text: str) -> set:
+    """Return the set of lowercased words used for lexical similarity."""
+    return set(w.lower() for w in text.split())
+
+
 def chunk_similarity(chunk_text: str, query: str) -> float:
     """Simple lexical similarity based on overlapping unique words."""
-    c_words = set(w.lower() for w in chunk_text.split())
-    q_words = set(w.lower() for w in query.split())
+    return set_similarity(word_set(chunk_text), word_set(query))
+
+
+def set_similarity(c_words: set, q_words: set) -> float:
+    """Lexical similarity between precomputed chunk and query word sets."""
     if not c_words or not q_words:
         return 0.0
     inter = len(c_words & q_words)
@@ -32,6 +40,55 @@ def retrieve_top_k(chunks: List[Dict], query: str, k: int) -> List[Dict]:
     return [c for _, c in scored[:k]]
 
 
+def top_k_candidates(
+    chunks: List[Dict], questions: List[Dict], top_k: int, offset: int = 0
+) -> List[List[Tuple]]:
+    """Return each question's top-k (score, position, chunk) among chunks.
+
+    Positions start at ``offset`` so candidates from consecutive batches of one
+    chunk list can be combined with ``merge_candidates``.
+    """
+    word_sets = [word_set(c["text"]) for c in chunks]
+    result = []
+    for q in questions:
+        q_words = word_set(q.get("question", ""))
+        scored = [
+            (set_similarity(words, q_words), offset + i, c)
+            for i, (words, c) in enumerate(zip(word_sets, chunks))
+        ]
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        result.append(scored[:top_k])
+    return result
+
+
+def merge_candidates(
+    candidate_lists: List[List[List[Tuple]]], questions: List[Dict], top_k: int
+) -> Tuple[Dict, List[Dict]]:
+    """Merge per-batch candidates into the same result as ``evaluate_strategy``.
+
+    Ties are broken by position, matching the stable sort in ``retrieve_top_k``.
+    """
+    per = []
+    for qi, q in enumerate(questions):
+        merged = sorted(
+            (c for candidates in candidate_lists for c in candidates[qi]),
+            key=lambda x: (-x[0], x[1]),
+        )
+        retrieved = [c for _, _, c in merged[:top_k]]
+        precision, recall, f1 = compute_precision_recall_f1(
+            retrieved, q.get("relevant", [])
+        )
+        per.append(
+            {
+                "question": q.get("question", ""),
+                "recall": recall,
+                "precision": precision,
+                "f1": f1,
+            }
+        )
+    return average_metrics(per), per
+
+
 def compute_recall(retrieved: List[Dict], relevant_phrases: List[str]) -> float:
     """Recall of relevant phrases contained in retrieved chunks."""
     if not relevant_phrases:
@@ -94,24 +151,22 @@ def evaluate_strategy(
         metrics_dict contains: avg_recall, avg_precision, avg_f1
     """
     per = []
-    recalls = []
-    precisions = []
-    f1s = []
     for q in questions:
         question = q.get("question", "")
         relevant = q.get("relevant", [])
         retrieved = retrieve_top_k(chunks, question, top_k)
         precision, recall, f1 = compute_precision_recall_f1(retrieved, relevant)
-        recalls.append(recall)
-        precisions.append(precision)
-        f1s.append(f1)
         per.append(
             {"question": question, "recall": recall, "precision": precision, "f1": f1}
         )
+    return average_metrics(per), per
+
 
-    metrics = {
-        "avg_recall": sum(recalls) / len(recalls) if recalls else 0.0,
-        "avg_precision": sum(precisions) / len(precisions) if precisions else 0.0,
-        "avg_f1": sum(f1s) / len(f1s) if f1s else 0.0,
+def average_metrics(per: List[Dict]) -> Dict:
+    """Average per-question recall, precision and F1 into a metrics dict."""
+    n = len(per)
+    return {
+        "avg_recall": sum(p["recall"] for p in per) / n if n else 0.0,
+        "avg_precision": sum(p["precision"] for p in per) / n if n else 0.0,
+        "avg_f1": sum(p["f1"] for p in per) / n if n else 0.0,
     }
-    return metrics, per
@@ -0,0 +1,126 @@
+"""Incremental chunking and evaluation state for watch mode."""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+from . import chunker
+from . import parser as mdparser
+from . import scorer
+
+
+def poll_changes(
+    folder: str, signatures: Dict[str, Tuple[int, int]]
+) -> Dict[str, Optional[str]]:
+    """Poll folder by mtime/size and return what changed since the last poll.
+
+    Files that disappear between listing and stat/read (e.g. while an editor
+    saves them) are treated as removed until a later poll sees them again.
+
+    Args:
+        folder: Folder to poll
+        signatures: (mtime_ns, size) per path from the previous poll; updated
+            in place
+
+    Returns:
+        Dict mapping changed or new paths to their text, and removed paths
+        to None
+    """
+    seen = {}
+    for f in mdparser.list_markdown_files(folder):
+        try:
+            st = os.stat(f)
+        except OSError:
+            continue
+        seen[str(f)] = (st.st_mtime_ns, st.st_size)
+    changes: Dict[str, Optional[str]] = {p: None for p in signatures if p not in seen}
+    for path, signature in seen.items():
+        if signatures.get(path) == signature:
+            continue
+        try:
+            _, text = mdparser.read_markdown_file(path)
+        except OSError:
+            if path in signatures:
+                changes[path] = None
+            continue
+        changes[path] = text
+        signatures[path] = signature
+    for path, text in changes.items():
+        if text is None:
+            del signatures[path]
+    return changes
+
+
+class WatchSession:
+    """Keep per-document chunks, retrieval index and question metrics in memory.
+
+    Each document keeps its chunks and its own top-k candidates per question.
+    When a document changes only that document is re-chunked and re-scored;
+    the global top-k for each question is then the best k among the
+    per-document candidates, which matches retrieving over all chunks at once.
+    """
+
+    def __init__(self, strategy: str, questions: List[Dict], top_k: int, **chunk_opts):
+        """Create an empty session.
+
+        Args:
+            strategy: Name of a strategy in ``chunker.STRATEGIES``
+            questions: Question dicts as returned by ``scorer.load_test_file``
+            top_k: Number of chunks to retrieve per question
+            chunk_opts: chunk_size, overlap, use_tiktoken and model passed
+                to the strategy
+        """
+        self.strategy = strategy
+        self.questions = questions or []
+        self.top_k = top_k
+        self.chunk_opts = chunk_opts
+        self.docs: Dict[str, Dict] = {}
+        self.per_questions: List[Dict] = []
+
+    def apply(self, changes: Dict[str, Optional[str]]):
+        """Re-index changed documents and drop removed ones.
+
+        Args:
+            changes: Mapping from ``poll_changes`` of path to new text, or
+                None for removed files
+        """
+        for path, text in changes.items():
+            if text is None:
+                self.docs.pop(path, None)
+            else:
+                self.docs[path] = self._index_document(text)
+        if changes:
+            self._refresh_questions()
+
+    def _index_document(self, text: str) -> Dict:
+        """Chunk one document and score its chunks against every question."""
+        if self.strategy not in chunker.STRUCTURE_AWARE_STRATEGIES:
+            text = mdparser.clean_markdown_text([("", text)])
+        chunks = chunker.STRATEGIES[self.strategy](text, **self.chunk_opts)
+        candidates = scorer.top_k_candidates(chunks, self.questions, self.top_k)
+        return {"chunks": chunks, "candidates": candidates}
+
+    def _refresh_questions(self):
+        """Merge per-document candidates into global top-k and rescore questions."""
+        candidate_lists = [
+            [
+                [(score, (d, i), chunk) for score, i, chunk in per_question]
+                for per_question in self.docs[path]["candidates"]
+            ]
+            for d, path in enumerate(sorted(self.docs))
+        ]
+        _, self.per_questions = scorer.merge_candidates(
+            candidate_lists, self.questions, self.top_k
+        )
+
+    def result_row(self) -> Dict:
+        """Return the summary row in the same shape as ``analyze`` results."""
+        metrics = scorer.average_metrics(self.per_questions)
+        return {
+            "strategy": self.strategy,
+            "chunks": sum(len(doc["chunks"]) for doc in self.docs.values()),
+            "avg_recall": round(metrics["avg_recall"], 4),
+            "avg_precision": round(metrics["avg_precision"], 4),
+            "avg_f1": round(metrics["avg_f1"], 4),
+            "saved": "(in memory)",
+            "per_questions": self.per_questions,
+        }
@@ -1,6 +1,12 @@
 """Basic tests for rag-chunk pipeline."""
 
-from src import chunker, parser, scorer
+import json
+from pathlib import Path
+
+import pytest
+
+from src import chunker, cli, parser, pipeline, scorer
+from src.watch import WatchSession, poll_changes
 
 
 def test_parser_clean():
@@ -85,3 +91,203 @@ def test_sliding_window_with_tiktoken_flag():
         text, chunk_size=4, overlap=1, use_tiktoken=False
     )
     assert len(chunks) > 0
+
+
+def test_markdown_section_chunking():
+    """Markdown-section chunking keeps code fences intact and records headings."""
+    text = (
+        "# Guide\n\nIntro text here.\n\n## Setup\n\n"
+        "```bash\n# not a heading\n\npip install rag-chunk\n```\n\n"
+        "## Usage\n\nRun the analyze command."
+    )
+    chunks = chunker.markdown_section_chunks(text, chunk_size=6)
+    code = [c for c in chunks if "pip install" in c["text"]]
+    assert len(code) == 1
+    assert "# not a heading" in code[0]["text"]
+    assert code[0]["heading_path"] == ["Guide", "Setup"]
+    assert chunks[-1]["heading_path"] == ["Guide", "Usage"]
+    assert all(c["id"] == i for i, c in enumerate(chunks))
+
+
+def test_sentence_pack_chunking():
+    """Sentence-pack chunking never cuts sentences and overlaps whole sentences."""
+    text = "One two three. Four five! Six seven eight nine? Ten."
+    chunks = chunker.sentence_pack_chunks(text, chunk_size=6, overlap=2)
+    assert [c["text"] for c in chunks] == [
+        "One two three. Four five!",
+        "Four five! Six seven eight nine?",
+        "Ten.",
+    ]
+    assert chunker.count_tokens_batch(["a b", "c"]) == [2, 1]
+
+
+def test_run_pipeline_preserves_order_and_reports_stages():
+    """Pipelined stages return results in input order with per-stage stats."""
+    results, stats = pipeline.run_pipeline(
+        range(10),
+        [("double", lambda x: x * 2, "thread"), ("inc", lambda x: x + 1, "thread")],
+        io_threads=3,
+        maxsize=2,
+    )
+    assert results == [x * 2 + 1 for x in range(10)]
+    assert [s["stage"] for s in stats] == ["double", "inc"]
+    assert all(s["items"] == 10 and 0.0 <= s["utilization"] for s in stats)
+
+
+def test_run_pipeline_process_stage_fan_out_and_errors():
+    """Process stages run picklable functions; fan-out and errors propagate."""
+    results, stats = pipeline.run_pipeline(
+        [-3, -1, -2],
+        [
+            ("abs", abs, "process"),
+            ("expand", lambda x: pipeline.FanOut([x, x * 10]), "thread"),
+            ("int", int, "process"),
+        ],
+        workers=3,
+    )
+    assert results == [3, 30, 1, 10, 2, 20]
+    assert [s["items"] for s in stats] == [3, 3, 6]
+    assert stats[0]["workers"] == stats[2]["workers"] == 3
+    assert all(s["busy_s"] >= 0.0 and s["wait_s"] >= 0.0 for s in stats)
+    with pytest.raises(ValueError):
+        pipeline.run_pipeline(["1", "x"], [("int", int, "process")])
+    with pytest.raises(ValueError):
+        pipeline.run_pipeline([1], [("abs", abs, "thread")], io_threads=0)
+
+
+def test_analyze_pipeline_matches_sequential(tmp_path, monkeypatch, capsys):
+    """analyze --pipeline reports the same result rows as the sequential run."""
+    examples = Path(__file__).resolve().parent.parent / "examples"
+    monkeypatch.chdir(tmp_path)
+    rows = []
+    for extra in ([], ["--pipeline"]):
+        args = cli.build_parser().parse_args(
+            ["analyze", str(examples), "--strategy", "sentence-pack", "--chunk-size", "20"]
+            + ["--test-file", str(examples / "questions.json"), "--output", "json"]
+            + extra
+        )
+        assert cli.analyze(args) == 0
+        results = json.loads(capsys.readouterr().out)["results"]
+        for r in results:
+            r.pop("saved")
+        rows.append(results)
+    assert rows[0] == rows[1]
+
+
+def test_watch_session_incremental_updates(tmp_path):
+    """Watch sessions re-index only changed files and match full evaluation."""
+    (tmp_path / "a.md").write_text("Retrieval finds chunks.", encoding="utf-8")
+    (tmp_path / "b.md").write_text("Generation writes answers.", encoding="utf-8")
+    questions = [{"question": "What does generation do?", "relevant": ["answers"]}]
+    session = WatchSession("paragraph", questions, 1, chunk_size=0, overlap=0)
+    signatures = {}
+    changes = poll_changes(str(tmp_path), signatures)
+    assert len(changes) == 2
+    session.apply(changes)
+    assert poll_changes(str(tmp_path), signatures) == {}
+    assert session.result_row()["avg_recall"] == 1.0
+
+    (tmp_path / "b.md").write_text("Generation is covered elsewhere.", encoding="utf-8")
+    changes = poll_changes(str(tmp_path), signatures)
+    assert list(changes) == [str(tmp_path / "b.md")]
+    session.apply(changes)
+    chunks = [c for p in sorted(session.docs) for c in session.docs[p]["chunks"]]
+    _, per = scorer.evaluate_strategy(chunks, questions, 1)
+    assert session.per_questions == per
+    assert session.result_row()["avg_recall"] == 0.0
+
+    (tmp_path / "a.md").unlink()
+    changes = poll_changes(str(tmp_path), signatures)
+    assert changes == {str(tmp_path / "a.md"): None}
+    session.apply(changes)
+    assert session.result_row()["chunks"] == 1
+
+
+def test_poll_changes_treats_vanished_files_as_removed(tmp_path, monkeypatch):
+    """Files that disappear before they are read do not abort the poll."""
+    path = tmp_path / "a.md"
+    path.write_text("Draft text.", encoding="utf-8")
+    signatures = {}
+    assert poll_changes(str(tmp_path), signatures) == {str(path): "Draft text."}
+
+    def vanished(_):
+        raise FileNotFoundError(str(path))
+
+    path.write_text("Saving new draft.", encoding="utf-8")
+    monkeypatch.setattr(parser, "read_markdown_file", vanished)
+    assert poll_changes(str(tmp_path), signatures) == {str(path): None}
+    monkeypatch.undo()
+    assert poll_changes(str(tmp_path), signatures) == {str(path): "Saving new draft."}
+
+
+def test_markdown_section_split_keeps_headings_with_content():
+    """Oversized sections never emit a heading-only chunk, even for parents."""
+    text = "# A\n## B\n\nw1 w2 w3\n\nw4 w5 w6"
+    chunks = chunker.markdown_section_chunks(text, chunk_size=5)
+    assert chunks[0]["text"] == "# A\n## B\n\nw1 w2 w3"
+    assert chunks[0]["heading_paths"] == [["A"], ["A", "B"]]
+    assert chunks[1]["text"] == "w4 w5 w6"
+
+
+def test_markdown_section_records_every_heading_path():
+    """Packed chunks spanning several sections list each heading path."""
+    text = "# Big\n\npara 3\n\n## Small\n\nok"
+    chunks = chunker.markdown_section_chunks(text, chunk_size=20)
+    assert len(chunks) == 1
+    assert chunks[0]["heading_path"] == ["Big"]
+    assert chunks[0]["heading_paths"] == [["Big"], ["Big", "Small"]]
+
+
+def test_sentence_pack_keeps_headings_separate():
+    """Headings without terminal punctuation are their own sentences."""
+    text = "# Title\nSome text. More text!\n\n## Sub\n\nLast one"
+    assert chunker.split_sentences(text) == [
+        "# Title",
+        "Some text.",
+        "More text!",
+        "## Sub",
+        "Last one",
+    ]
+    assert "sentence-pack" in chunker.STRUCTURE_AWARE_STRATEGIES
+
+
+def test_markdown_section_chunks_documents_independently():
+    """Headings and unclosed fences never carry over into the next document."""
+    docs = [
+        ("a.md", "# Install\n\nsteps\n\n```bash\npip install rag-chunk"),
+        ("b.md", "Intro para.\n\n# Usage\n\nRun it."),
+    ]
+    texts = cli._strategy_texts("markdown-section", "", docs)
+    chunks = chunker.chunk_documents("markdown-section", texts, chunk_size=3)
+    assert [c["id"] for c in chunks] == list(range(len(chunks)))
+    intro = next(c for c in chunks if c["text"] == "Intro para.")
+    assert intro["heading_path"] == []
+    assert any(c["heading_path"] == ["Usage"] for c in chunks)
+
+
+def test_markdown_heading_closing_sequence():
+    """Only a space-separated closing '#' sequence is stripped from titles."""
+    chunks = chunker.markdown_section_chunks("# C#\n\nbody\n\n## Setup ##\n\nmore")
+    assert chunks[0]["heading_paths"] == [["C#"], ["C#", "Setup"]]
+
+
+def test_split_sentences_keeps_code_fences_whole():
+    """Fenced code is one unit: no splits at '1.' and no '# comment' heading."""
+    fence = "```python\nx = 1. y = 2\n# comment\n```"
+    text = f"Intro here. Next one.\n\n{fence}\n\nAfter it."
+    assert chunker.split_sentences(text) == [
+        "Intro here.",
+        "Next one.",
+        fence,
+        "After it.",
+    ]
+
+
+def test_watch_rejects_missing_folder_and_bad_interval(tmp_path, capsys):
+    """watch exits non-zero for a missing folder; --interval must be positive."""
+    args = cli.build_parser().parse_args(["watch", str(tmp_path / "missing")])
+    assert cli.watch(args) == 1
+    assert "Folder not found" in capsys.readouterr().out
+    for interval in ("0", "-1"):
+        with pytest.raises(SystemExit):
+            cli.build_parser().parse_args(["watch", str(tmp_path), "--interval", interval])